@@ -1,20 +1,20 @@
 from __future__ import annotations
 
-from functools import cached_property, wraps
-from typing import Any, Callable, TypeVar
+from dataclasses import astuple
+from functools import lru_cache, wraps
+from typing import Any, Callable, ClassVar, Generic, Literal, TypeVar, overload
 
 from vsexprtools import norm_expr
 from vskernels import Bilinear, BorderHandling, Hermite, Kernel, KernelT, Point, Scaler, ScalerT
 from vskernels.types import LeftShift, TopShift
 from vsmasktools import KirschTCanny, based_diff_mask
-from vsmasktools.utils import _get_region_expr
 from vstools import (
-    ColorRange, DitherType, FieldBased, FieldBasedT, FrameRangeN, FrameRangesN, check_variable,
-    core, depth, get_peak_value, get_y, join, limiter, replace_ranges, split, vs
+    ColorRange, CustomValueError, DependencyNotFoundError, DitherType, FieldBased, FieldBasedT, FrameRangeN,
+    FrameRangesN, FuncExceptT, KwargsT, check_ref_clip, check_variable, core, depth, get_neutral_value,
+    get_peak_value, get_video_format, get_y, join, limiter, plane, replace_ranges, vs
 )
 
 from .helpers import BottomCrop, CropRel, LeftCrop, RightCrop, ScalingArgs, TopCrop
-from .onnx import ArtCNN
 
 __all__ = [
     'Rescale',
@@ -24,27 +24,249 @@ __all__ = [
 
 RescaleT = TypeVar('RescaleT', bound="RescaleBase")
 
+_PROP_NAMES = {
+    '_generate_descale': 'RescaleDescaleFrom',
+    '_generate_descale_ignore_mask': 'RescaleDescaleFrom',
+    '_generate_rescale': 'RescaleRescaleFrom',
+    '_generate_doubled': 'RescaleDoubledFrom',
+    '_generate_upscale': 'RescaleUpscaleFrom',
+}
+
+# 3x3 Maximum followed by 3x3 Minimum (morphological closing) in a single Expr pass.
+# Mirrored pixel access matches the edge handling of std.Maximum/std.Minimum.
+_CLOSING_EXPR = ' '.join(
+    ' '.join(f'x[{dx + ix},{dy + iy}]:m' for iy in (-1, 0, 1) for ix in (-1, 0, 1)) + ' max' * 8
+    for dy in (-1, 0, 1) for dx in (-1, 0, 1)
+) + ' min' * 8
+
+# Kirsch edge magnitude followed by a 3x3 closing, for the placebo line mask path.
+_LINE_MASK_SHADER = """
+//!HOOK LUMA
+//!BIND HOOKED
+//!SAVE KIRSCH
+//!DESC vsscale line mask (Kirsch)
+
+vec4 hook() {
+    float ring[8] = float[8](
+        HOOKED_texOff(vec2(-1, -1)).x, HOOKED_texOff(vec2(0, -1)).x, HOOKED_texOff(vec2(1, -1)).x,
+        HOOKED_texOff(vec2(1, 0)).x, HOOKED_texOff(vec2(1, 1)).x, HOOKED_texOff(vec2(0, 1)).x,
+        HOOKED_texOff(vec2(-1, 1)).x, HOOKED_texOff(vec2(-1, 0)).x
+    );
+
+    float total = 0.0;
+    for (int i = 0; i < 8; i++)
+        total += ring[i];
+
+    float grad = 0.0;
+    for (int i = 0; i < 8; i++)
+        grad = max(grad, abs(8.0 * (ring[i] + ring[(i + 1) % 8] + ring[(i + 2) % 8]) - 3.0 * total));
+
+    return vec4(clamp(grad, 0.0, 1.0), 0.0, 0.0, 0.0);
+}
+
+//!HOOK LUMA
+//!BIND KIRSCH
+//!SAVE DILATED
+//!DESC vsscale line mask (dilation)
+
+vec4 hook() {
+    float value = 0.0;
+    for (int y = -1; y <= 1; y++)
+        for (int x = -1; x <= 1; x++)
+            value = max(value, KIRSCH_texOff(vec2(x, y)).x);
+
+    return vec4(value, 0.0, 0.0, 0.0);
+}
+
+//!HOOK LUMA
+//!BIND DILATED
+//!DESC vsscale line mask (erosion)
+
+vec4 hook() {
+    float value = 1.0;
+    for (int y = -1; y <= 1; y++)
+        for (int x = -1; x <= 1; x++)
+            value = min(value, DILATED_texOff(vec2(x, y)).x);
+
+    return vec4(value, 0.0, 0.0, 0.0);
+}
+"""
+
+_T = TypeVar('_T')
+
+
+@lru_cache(maxsize=64)
+def _region_expr(width: int, height: int, left: int, right: int, top: int, bottom: int, replace: str) -> str:
+    # Same expression as vsmasktools' _get_region_expr, keyed on plain values so it can be memoized
+    return f'X {left} < X {width - right - 1} > or Y {top} < Y {height - bottom - 1} > or or {replace} ?'
+
+
+@lru_cache
+def _numba_diff_mask_kernel() -> Callable[..., None]:
+    import numpy as np
+    from numba import njit, prange  # type: ignore[import-untyped]
+
+    # Same processing as based_diff_mask with its default arguments:
+    # absolute difference, RemoveGrain mode 2 applied twice, binarization and elliptical expand
+    @njit(parallel=True, fastmath=True)  # type: ignore[misc]
+    def _diff_mask(
+        src: Any, ref: Any, thr: float, peak: float, expand: int, work: Any, temp: Any, out: Any
+    ) -> None:
+        height, width = src.shape
+
+        for y in prange(height):
+            for x in range(width):
+                work[y, x] = abs(float(src[y, x]) - float(ref[y, x]))
+
+        for _ in range(2):
+            temp[:, :] = work
+
+            for y in prange(1, height - 1):
+                for x in range(1, width - 1):
+                    lo1 = lo2 = np.inf
+                    hi1 = hi2 = -np.inf
+
+                    for dy in range(-1, 2):
+                        for dx in range(-1, 2):
+                            if dy == 0 and dx == 0:
+                                continue
+
+                            v = work[y + dy, x + dx]
+
+                            if v < lo1:
+                                lo1, lo2 = v, lo1
+                            elif v < lo2:
+                                lo2 = v
+
+                            if v > hi1:
+                                hi1, hi2 = v, hi1
+                            elif v > hi2:
+                                hi2 = v
+
+                    temp[y, x] = min(max(work[y, x], lo2), hi2)
+
+            work, temp = temp, work
+
+        for y in prange(height):
+            for x in range(width):
+                work[y, x] = peak if work[y, x] * 16 / peak >= thr else 0
+
+        for radius in range(expand, 0, -1):
+            # Morpho.expand with XxpandMode.ELLIPSE alternates diamond and square 3x3 neighbourhoods
+            square = radius % 3 == 1
+
+            for y in prange(height):
+                for x in range(width):
+                    v = work[y, x]
+
+                    for dy in range(-1, 2):
+                        for dx in range(-1, 2):
+                            if not square and dy != 0 and dx != 0:
+                                continue
+
+                            if 0 <= y + dy < height and 0 <= x + dx < width:
+                                v = max(v, work[y + dy, x + dx])
+
+                    temp[y, x] = v
+
+            work, temp = temp, work
+
+        out[:, :] = work
+
+    return _diff_mask  # type: ignore[no-any-return]
+
+
+def _numba_diff_mask(
+    src: vs.VideoNode, ref: vs.VideoNode, thr: float, expand: int, func: FuncExceptT
+) -> vs.VideoNode:
+    try:
+        import numpy as np
+
+        kernel = _numba_diff_mask_kernel()
+    except ModuleNotFoundError as e:
+        raise DependencyNotFoundError(func, e)
+
+    # The kernel reads both planes blindly, so they must share dimensions and format
+    ref = check_ref_clip(src, depth(ref, src), func)
+
+    peak = get_peak_value(src, False, ColorRange.FULL)
+
+    def _process(n: int, f: list[vs.VideoFrame]) -> vs.VideoFrame:
+        fout = f[0].copy()
+        out = np.asarray(fout[0])
+
+        kernel(
+            np.asarray(f[0][0]), np.asarray(f[1][0]), thr, peak, expand,
+            np.empty(out.shape, np.float32), np.empty(out.shape, np.float32), out
+        )
+
+        return fout
+
+    return ColorRange.FULL.apply(src.std.ModifyFrame([src, ref], _process))
+
+
+class _cached(Generic[_T]):
+    """
+    Lock-free replacement for ``functools.cached_property``.
+
+    The result is stored in the instance ``__dict__`` under the same name,
+    shadowing the descriptor so subsequent accesses are plain attribute lookups.
+    Deleting the attribute makes the descriptor fire again on next access.
+    """
+
+    def __init__(self, fn: Callable[[Any], _T]) -> None:
+        self.fn = fn
+        self.name = fn.__name__
+        self.__doc__ = fn.__doc__
+
+    @overload
+    def __get__(self, obj: None, owner: type | None = None) -> _cached[_T]:
+        ...
+
+    @overload
+    def __get__(self, obj: object, owner: type | None = None) -> _T:
+        ...
+
+    def __get__(self, obj: object | None, owner: type | None = None) -> _cached[_T] | _T:
+        if obj is None:
+            return self
+
+        value = obj.__dict__[self.name] = self.fn(obj)
+
+        return value
+
 
 class RescaleBase:
     descale_args: ScalingArgs
     field_based: FieldBased | None
 
+    _DEPS: ClassVar[dict[str, tuple[str, ...]]] = {
+        'descale': ('rescale', 'doubled', 'upscale'),
+        'doubled': ('upscale',)
+    }
+
     def __init__(
         self,
         clip: vs.VideoNode,
         /,
         kernel: KernelT,
-        upscaler: ScalerT = ArtCNN,
+        upscaler: ScalerT | None = None,
         downscaler: ScalerT = Hermite(linear=True),
         field_based: FieldBasedT | bool | None = None,
         border_handling: int | BorderHandling = BorderHandling.MIRROR
     ) -> None:
         assert check_variable(clip, self.__class__)
 
-        self.clipy, *chroma = split(clip)
-        self.chroma = chroma
+        self.clipy = get_y(clip)
+        self._clip_for_chroma = clip
 
         self.kernel = Kernel.ensure_obj(kernel)
+
+        if upscaler is None:
+            from .onnx import ArtCNN
+
+            upscaler = ArtCNN
+
         self.upscaler = Scaler.ensure_obj(upscaler)
 
         self.downscaler = Scaler.ensure_obj(downscaler)
@@ -53,16 +275,15 @@ class RescaleBase:
 
         self.border_handling = BorderHandling(int(border_handling))
 
+        self._rescale_from_cache = dict[tuple[Any, ...], str]()
+
+        self._kwargs_cache = dict[tuple[Any, ...], KwargsT]()
+
     def __delattr__(self, __name: str) -> None:
-        match __name:
-            case 'descale':
-                self._trydelattr('rescale')
-                self._trydelattr('doubled')
-            case 'doubled':
-                self._trydelattr('upscale')
-            case _:
-                pass
-        delattr(self, __name)
+        for dep in self._DEPS.get(__name, ()):
+            self._trydelattr(dep)
+
+        super().__delattr__(__name)
 
     def _trydelattr(self, attr: str) -> None:
         try:
@@ -70,6 +291,33 @@ class RescaleBase:
         except AttributeError:
             pass
 
+    @property
+    def _rescale_from(self) -> str:
+        # descale_args can be assigned after RescaleBase.__init__ and changed later on,
+        # so the prop value is built on first use and keyed on what it's made of
+        key = (self.kernel.__class__, self.descale_args.src_width, self.descale_args.src_height)
+        rescale_from = self._rescale_from_cache.get(key)
+
+        if rescale_from is None:
+            w, h = (
+                f"{int(d)}" if d.is_integer() else f"{d:.2f}"
+                for d in [self.descale_args.src_width, self.descale_args.src_height]
+            )
+            rescale_from = self._rescale_from_cache[key] = f'{self.kernel.__class__.__name__} - {w} x {h}'
+
+        return rescale_from
+
+    def _descale_kwargs(self) -> KwargsT:
+        # Keyed on the field values, so the 'h'/'w'/'hw' mode toggling of the ignore_mask descale path
+        # and in-place changes to descale_args are both picked up
+        key = astuple(self.descale_args)
+        kwargs = self._kwargs_cache.get(key)
+
+        if kwargs is None:
+            kwargs = self._kwargs_cache[key] = self.descale_args.kwargs()
+
+        return kwargs
+
     @staticmethod
     def _apply_field_based(
         function: Callable[[RescaleT, vs.VideoNode], vs.VideoNode]
@@ -82,21 +330,26 @@ class RescaleBase:
                 return FieldBased.PROGRESSIVE.apply(clip)
             else:
                 return function(self, clip)
+
+        wrap._without_field_based = function  # type: ignore[attr-defined]
+
         return wrap
 
     @staticmethod
     def _add_props(
         function: Callable[[RescaleT, vs.VideoNode], vs.VideoNode]
     ) -> Callable[[RescaleT, vs.VideoNode], vs.VideoNode]:
+        prop = _PROP_NAMES.get(
+            function.__name__, "Rescale" + function.__name__.split('_')[-1].capitalize() + 'From'
+        )
+
+        # Skip the _apply_field_based wrapper entirely when there's no field based processing to do
+        plain = getattr(function, '_without_field_based', function)
+
         @wraps(function)
         def wrap(self: RescaleT, clip: vs.VideoNode) -> vs.VideoNode:
-            w, h = (
-                f"{int(d)}" if d.is_integer() else f"{d:.2f}"
-                for d in [self.descale_args.src_width, self.descale_args.src_height]
-            )
-            return function(self, clip).std.SetFrameProp(
-                "Rescale" + function.__name__.split('_')[-1].capitalize() + 'From',
-                data=f'{self.kernel.__class__.__name__} - {w} x {h}'
+            return (function if self.field_based else plain)(self, clip).std.SetFrameProp(
+                prop, data=self._rescale_from
             )
         return wrap
 
@@ -106,7 +359,7 @@ class RescaleBase:
         return self.kernel.descale(
             clip,
             self.descale_args.width, self.descale_args.height,
-            **self.descale_args.kwargs(),
+            **self._descale_kwargs(),
             border_handling=self.border_handling
         )
 
@@ -116,7 +369,7 @@ class RescaleBase:
         return self.kernel.scale(
             clip,
             self.clipy.width, self.clipy.height,
-            **self.descale_args.kwargs(),
+            **self._descale_kwargs(),
             border_handling=self.border_handling
         )
 
@@ -132,25 +385,34 @@ class RescaleBase:
             **self.descale_args.kwargs(clip)
         )
 
-    @cached_property
+    @_cached
     def descale(self) -> vs.VideoNode:
         return self._generate_descale(self.clipy)
 
-    @cached_property
+    @_cached
     def rescale(self) -> vs.VideoNode:
         return self._generate_rescale(self.descale)
 
-    @cached_property
+    @_cached
     def doubled(self) -> vs.VideoNode:
         return self._generate_doubled(self.descale)
 
-    @cached_property
+    @_cached
+    def chroma(self) -> list[vs.VideoNode]:
+        if get_video_format(self._clip_for_chroma).color_family is vs.GRAY:
+            return []
+
+        return [plane(self._clip_for_chroma, 1), plane(self._clip_for_chroma, 2)]
+
+    @_cached
     def upscale(self) -> vs.VideoNode:
         """Returns the upscaled clip"""
-        return join(
-            self._generate_upscale(self.doubled),
-            *self.chroma
-        ).std.CopyFrameProps(self.clipy, '_ChromaLocation')
+        upscale = self._generate_upscale(self.doubled)
+
+        if not self.chroma:
+            return upscale
+
+        return join(upscale, *self.chroma).std.CopyFrameProps(self.clipy, '_ChromaLocation')
 
 
 class Rescale(RescaleBase):
@@ -238,7 +500,7 @@ class Rescale(RescaleBase):
         /,
         height: int | float,
         kernel: KernelT,
-        upscaler: ScalerT = ArtCNN,
+        upscaler: ScalerT | None = None,
         downscaler: ScalerT = Hermite(linear=True),
         width: int | float | None = None,
         base_height: int | None = None,
@@ -246,7 +508,8 @@ class Rescale(RescaleBase):
         crop: tuple[LeftCrop, RightCrop, TopCrop, BottomCrop] = CropRel(),
         shift: tuple[TopShift, LeftShift] = (0, 0),
         field_based: FieldBasedT | bool | None = None,
-        border_handling: int | BorderHandling = BorderHandling.MIRROR
+        border_handling: int | BorderHandling = BorderHandling.MIRROR,
+        mask_depth: int | None = None
     ) -> None:
         """Initialize the rescaling process.
 
@@ -274,10 +537,15 @@ class Rescale(RescaleBase):
                                         2: Assume the image was resized with extend padding,
                                            where the outermost row was extended infinitely far.
                                     Defaults to 0
+        :param mask_depth:          Bitdepth the line and credit masks are processed at, either 8, 16 or 32.
+                                    They are only brought to the clip bitdepth when merging.
+                                    If None, the clip bitdepth is used. Defaults to None
         """
         self._line_mask: vs.VideoNode | None = None
+        self._line_mask_borderfixed = False
         self._credit_mask: vs.VideoNode | None = None
         self._ignore_mask: vs.VideoNode | None = None
+        self._ignore_mask_h_cache = dict[int, vs.VideoNode]()
         self._crop = crop
         self._pre = clip
 
@@ -287,75 +555,98 @@ class Rescale(RescaleBase):
 
         super().__init__(clip, kernel, upscaler, downscaler, field_based, border_handling)
 
+        if mask_depth is None:
+            self._mask_format = get_video_format(self.clipy)
+        elif mask_depth in (8, 16, 32):
+            self._mask_format = get_video_format(self.clipy).replace(
+                bits_per_sample=mask_depth, sample_type=vs.SampleType(mask_depth == 32)
+            )
+        else:
+            raise CustomValueError('mask_depth must be either 8, 16 or 32!', self.__class__, mask_depth)
+
         if self._crop > (0, 0, 0, 0):
             self.clipy = self.clipy.std.Crop(*self._crop)
 
     def _generate_descale(self, clip: vs.VideoNode) -> vs.VideoNode:
-        if not self._ignore_mask:
-            return super()._generate_descale(clip)
+        if self._ignore_mask:
+            return self._generate_descale_ignore_mask(clip)
 
-        @self._add_props
-        @self._apply_field_based
-        def _generate_descale_ignore_mask(self: Rescale, clip: vs.VideoNode) -> vs.VideoNode:
-            assert self._ignore_mask
+        return super()._generate_descale(clip)
 
-            self.descale_args.mode = 'h'
+    @RescaleBase._add_props
+    @RescaleBase._apply_field_based
+    def _generate_descale_ignore_mask(self, clip: vs.VideoNode) -> vs.VideoNode:
+        assert self._ignore_mask
 
-            descale_h = self.kernel.descale(
-                clip,
-                None, self.descale_args.height,
-                **self.descale_args.kwargs(),
-                border_handling=self.border_handling,
-                ignore_mask=self._ignore_mask
-            )
+        self.descale_args.mode = 'h'
 
-            self.descale_args.mode = 'w'
+        descale_h = self.kernel.descale(
+            clip,
+            None, self.descale_args.height,
+            **self._descale_kwargs(),
+            border_handling=self.border_handling,
+            ignore_mask=self._ignore_mask
+        )
 
-            descale_w = self.kernel.descale(
-                descale_h,
-                self.descale_args.width, None,
-                **self.descale_args.kwargs(),
-                border_handling=self.border_handling,
-                ignore_mask=Point.scale(self._ignore_mask, height=descale_h.height)
+        self.descale_args.mode = 'w'
+
+        ignore_mask_h = self._ignore_mask_h_cache.get(descale_h.height)
+
+        if ignore_mask_h is None:
+            ignore_mask_h = self._ignore_mask_h_cache[descale_h.height] = Point.scale(
+                self._ignore_mask, height=descale_h.height
             )
 
-            self.descale_args.mode = 'hw'
+        descale_w = self.kernel.descale(
+            descale_h,
+            self.descale_args.width, None,
+            **self._descale_kwargs(),
+            border_handling=self.border_handling,
+            ignore_mask=ignore_mask_h
+        )
 
-            return descale_w
+        self.descale_args.mode = 'hw'
 
-        return _generate_descale_ignore_mask(self, clip)
+        return descale_w
 
     def _generate_upscale(self, clip: vs.VideoNode) -> vs.VideoNode:
         upscale = super()._generate_upscale(clip)
 
         merged_mask = norm_expr([self.line_mask, self.credit_mask], "x y - 0 yrange_max clamp")
+        merged_mask = depth(
+            merged_mask, self.clipy, dither_type=DitherType.NONE, range_in=ColorRange.FULL, range_out=ColorRange.FULL
+        )
 
         upscale = core.std.MaskedMerge(self.clipy, upscale, merged_mask).std.CopyFrameProps(upscale)
 
         if self._crop > (0, 0, 0, 0):
             pre_y = get_y(self._pre)
-            black = pre_y.std.BlankClip()
-            mask = norm_expr(
-                black, _get_region_expr(
-                    black, *self._crop, replace=f'{get_peak_value(black, False, ColorRange.FULL)} x'
-                )
-            )
 
-            upscale = core.std.MaskedMerge(upscale.std.AddBorders(*self._crop), pre_y, mask)
+            upscale = norm_expr(
+                [upscale.std.AddBorders(*self._crop), pre_y],
+                _region_expr(pre_y.width, pre_y.height, *self._crop, 'y x')
+            )
 
         return upscale
 
     @property
     def line_mask(self) -> vs.VideoNode:
+        if self._line_mask_borderfixed:
+            assert self._line_mask
+            return self._line_mask
+
         lm = self._line_mask or self.clipy.std.BlankClip(
-            color=get_peak_value(self.clipy, False, ColorRange.FULL)
+            format=self._mask_format.id, color=get_peak_value(self._mask_format, False, ColorRange.FULL)
         )
 
         if self.border_handling:
             px = (self.kernel.kernel_radius, ) * 4
-            lm = norm_expr(lm, _get_region_expr(lm, *px, replace=f'{get_peak_value(lm, False, ColorRange.FULL)} x'))
+            lm = norm_expr(
+                lm, _region_expr(lm.width, lm.height, *px, f'{get_peak_value(lm, False, ColorRange.FULL)} x')
+            )
 
         self._line_mask = lm
+        self._line_mask_borderfixed = True
 
         return self._line_mask
 
@@ -363,27 +654,30 @@ class Rescale(RescaleBase):
     def line_mask(self, mask: vs.VideoNode | None) -> None:
         self._line_mask = (
             limiter(depth(
-                mask, self.clipy, dither_type=DitherType.NONE, range_in=ColorRange.FULL, range_out=ColorRange.FULL
+                mask, self._mask_format, dither_type=DitherType.NONE,
+                range_in=ColorRange.FULL, range_out=ColorRange.FULL
             ))
             if mask else mask
         )
+        self._line_mask_borderfixed = False
 
     @line_mask.deleter
     def line_mask(self) -> None:
         self._line_mask = None
+        self._line_mask_borderfixed = False
 
     @property
     def credit_mask(self) -> vs.VideoNode:
-        if self._credit_mask:
-            return self._credit_mask
-        self.credit_mask = self.clipy.std.BlankClip()
-        return self.credit_mask
+        if not self._credit_mask:
+            self._credit_mask = self.clipy.std.BlankClip(format=self._mask_format.id)
+        return self._credit_mask
 
     @credit_mask.setter
     def credit_mask(self, mask: vs.VideoNode | None) -> None:
         self._credit_mask = (
             limiter(depth(
-                mask, self.clipy, dither_type=DitherType.NONE, range_in=ColorRange.FULL, range_out=ColorRange.FULL
+                mask, self._mask_format, dither_type=DitherType.NONE,
+                range_in=ColorRange.FULL, range_out=ColorRange.FULL
             ))
             if mask else mask
         )
@@ -394,10 +688,9 @@ class Rescale(RescaleBase):
 
     @property
     def ignore_mask(self) -> vs.VideoNode:
-        if self._ignore_mask:
-            return self._ignore_mask
-        self.ignore_mask = self.clipy.std.BlankClip(format=vs.GRAY8)
-        return self.ignore_mask
+        if not self._ignore_mask:
+            self._ignore_mask = self.clipy.std.BlankClip(format=vs.GRAY8)
+        return self._ignore_mask
 
     @ignore_mask.setter
     def ignore_mask(self, mask: vs.VideoNode | None) -> None:
@@ -405,38 +698,83 @@ class Rescale(RescaleBase):
             depth(mask, 8, dither_type=DitherType.NONE, range_in=ColorRange.FULL, range_out=ColorRange.FULL)
             if mask else mask
         )
+        self._ignore_mask_h_cache.clear()
 
     @ignore_mask.deleter
     def ignore_mask(self) -> None:
         self._ignore_mask = None
+        self._ignore_mask_h_cache.clear()
 
     def default_line_mask(
-        self, clip: vs.VideoNode | None = None, scaler: ScalerT = Bilinear, **kwargs: Any
+        self, clip: vs.VideoNode | None = None, scaler: ScalerT = Bilinear,
+        device: Literal['cpu', 'gpu'] = 'cpu', **kwargs: Any
     ) -> vs.VideoNode:
         """
         Load a default Kirsch line mask in the class instance. Additionnaly, it is returned.
 
         :param clip:    Reference clip, defaults to doubled clip if None.
         :param scaler:  Scaled used for matching the source clip format, defaults to Bilinear
+        :param device:  Where to compute the mask. 'gpu' runs the edge detection, closing and
+                        bilinear resampling through vs-placebo in a single upload/download.
+                        Only the default Bilinear ``scaler`` is supported with it, and additional edgemask
+                        arguments aren't either. Defaults to 'cpu'
         :return:        Generated mask.
         """
+        if device not in ('cpu', 'gpu'):
+            raise CustomValueError('device must be either "cpu" or "gpu"!', self.default_line_mask, device)
+
+        if device == 'gpu':
+            if kwargs:
+                raise CustomValueError(
+                    'The gpu path doesn\'t support additional arguments!', self.default_line_mask, kwargs
+                )
+
+            if type(Scaler.ensure_obj(scaler)) is not Bilinear:
+                raise CustomValueError(
+                    'The gpu path only supports Bilinear as scaler!', self.default_line_mask, scaler
+                )
+
+            self.line_mask = self._placebo_line_mask(clip)
+
+            return self.line_mask
+
         scaler = Scaler.ensure_obj(scaler)
         scale_kwargs = scaler.kwargs if clip else self.descale_args.kwargs(self.doubled) | scaler.kwargs
 
         clip = clip if clip else self.doubled
 
-        line_mask = KirschTCanny.edgemask(clip, **kwargs).std.Maximum().std.Minimum()
-        line_mask = scaler.scale(line_mask, self.clipy.width, self.clipy.height, format=self.clipy.format, **scale_kwargs)
+        line_mask = norm_expr(KirschTCanny.edgemask(clip, **kwargs), _CLOSING_EXPR)
+        line_mask = scaler.scale(
+            line_mask, self.clipy.width, self.clipy.height, format=self._mask_format, **scale_kwargs
+        )
 
         self.line_mask = line_mask
 
         return self.line_mask
 
+    def _placebo_line_mask(self, clip: vs.VideoNode | None = None) -> vs.VideoNode:
+        if not hasattr(core, 'placebo'):
+            raise DependencyNotFoundError(self.default_line_mask, 'vs-placebo')
+
+        scale_kwargs = {} if clip else self.descale_args.kwargs(self.doubled)
+
+        clip = depth(get_y(clip if clip else self.doubled), 16, dither_type=DitherType.NONE)
+        neutral = clip.std.BlankClip(color=get_neutral_value(clip), keep=True)
+
+        edges = get_y(join(clip, neutral, neutral).placebo.Shader(shader_s=_LINE_MASK_SHADER, filter='box'))
+
+        return edges.placebo.Resample(
+            self.clipy.width, self.clipy.height, 'bilinear',
+            sx=scale_kwargs.get('src_left', 0), sy=scale_kwargs.get('src_top', 0),
+            src_width=scale_kwargs.get('src_width', edges.width),
+            src_height=scale_kwargs.get('src_height', edges.height)
+        )
+
     def default_credit_mask(
         self, rescale: vs.VideoNode | None = None, src: vs.VideoNode | None = None,
         thr: float = 0.216, expand: int = 4,
         ranges: FrameRangeN | FrameRangesN | None = None, exclusive: bool = False,
-        **kwargs: Any
+        use_numba: bool = False, **kwargs: Any
     ) -> vs.VideoNode:
         """
         Load a credit mask by making a difference mask between src and rescaled clips
@@ -447,6 +785,10 @@ class Rescale(RescaleBase):
         :param expand:      Additional expand radius applied to the mask, defaults to 4
         :param ranges:      If specified, ranges to apply the credit clip to
         :param exclusive:   Use exclusive ranges (Default: False)
+        :param use_numba:   Compute the mask in a parallel numba kernel instead of ``based_diff_mask``.
+                            It reproduces ``based_diff_mask`` with its default prefilter, postfilter and ampl,
+                            so additional ``based_diff_mask`` arguments aren't accepted.
+                            Requires numba and numpy (Default: False)
         :return:            Generated mask
         """
         if not src:
@@ -454,11 +796,19 @@ class Rescale(RescaleBase):
         if not rescale:
             rescale = self.rescale
 
+        if use_numba and kwargs:
+            raise CustomValueError(
+                'The numba path doesn\'t support additional arguments!', self.default_credit_mask, kwargs
+            )
+
         src, rescale = get_y(src), get_y(rescale)
 
-        credit_mask = based_diff_mask(
-            src, rescale, thr=thr, expand=expand, func=self.default_credit_mask, **kwargs
-        )
+        if use_numba:
+            credit_mask = _numba_diff_mask(src, rescale, thr, expand, self.default_credit_mask)
+        else:
+            credit_mask = based_diff_mask(
+                src, rescale, thr=thr, expand=expand, func=self.default_credit_mask, **kwargs
+            )
 
         if ranges is not None:
             credit_mask = replace_ranges(credit_mask.std.BlankClip(keep=True), credit_mask, ranges, exclusive)